@@ -3,16 +3,140 @@
 from __future__ import annotations
 
 import argparse
+import json
+import logging
+import os
 import sqlite3
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Callable, Iterable
+from typing import Callable, Iterable, Iterator
 
-import pandas as pd
-import nflreadpy as nfl
 import polars as pl
+import polars.selectors as cs
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# nflreadpy reads these at import time. A filesystem cache under the repository
+# is shared (and written) by both the Streamlit app and exporter runs, so quick
+# re-runs reuse downloads instead of hitting the network again.
+os.environ.setdefault("NFLREADPY_CACHE", "filesystem")
+os.environ.setdefault("NFLREADPY_CACHE_DIR", str(ROOT_DIR / ".nfl_cache"))
+os.environ.setdefault("NFLREADPY_CACHE_DURATION", "3600")
+
+import nflreadpy as nfl  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+# One ingest_metadata row:
+# (table_name, season, summary_level, ingested_at, content_hash).
+MetadataRow = tuple[str, int, str | None, str, str]
 
 ADV_STAT_TYPES = ["pass", "rush", "rec", "def"]
+# Every table the exporter can write, for validating --columns.
+EXPORT_TABLES = {
+    "team_stats",
+    "schedules",
+    "rosters",
+    "injuries",
+    *(
+        f"pfr_advstats_{stat_type}_{summary}"
+        for stat_type in ADV_STAT_TYPES
+        for summary in ("week", "season")
+    ),
+}
+DOWNLOAD_WORKERS = 6
+# Feeds a season cannot be exported without; the others are skipped with a
+# warning when nflreadpy has not published them yet.
+REQUIRED_TABLES = {"team_stats", "schedules"}
+# Rebuild a table instead of deleting from it when fewer rows than this share
+# survive the removal of the season being refreshed.
+SWAP_KEEP_RATIO = 0.3
+# Written into every run directory: the seasons staged so far and the summary
+# levels they were downloaded with, so --from-staging loads exactly that.
+STAGE_MANIFEST = "manifest.json"
+# Rows handed to each executemany call when writing a frame; override with
+# NFL_DATA_INSERT_BATCH_ROWS.
+INSERT_BATCH_ROWS = 20000
+
+# Column types for tables created by the exporter, keyed by Polars dtype. The
+# schema is fixed when a table is first created so later seasons cannot drift.
+# Dtypes not listed here become TEXT columns, and write_frame stores their
+# values as text: nested types as JSON, everything else cast to a string.
+SQLITE_TYPES: dict[type[pl.DataType], str] = {
+    pl.Int8: "INTEGER",
+    pl.Int16: "INTEGER",
+    pl.Int32: "INTEGER",
+    pl.Int64: "INTEGER",
+    pl.UInt8: "INTEGER",
+    pl.UInt16: "INTEGER",
+    pl.UInt32: "INTEGER",
+    pl.UInt64: "INTEGER",
+    pl.Boolean: "INTEGER",
+    pl.Float32: "REAL",
+    pl.Float64: "REAL",
+    # Stored as integers in the column's time unit, as pandas.to_sql did.
+    pl.Duration: "INTEGER",
+    pl.Binary: "BLOB",
+    pl.String: "TEXT",
+    pl.Date: "TEXT",
+    pl.Datetime: "TEXT",
+    pl.Time: "TEXT",
+}
+# Text layout of temporal values, matching the rows pandas.to_sql wrote before:
+# datetimes follow isoformat(" ") (microseconds only when non-zero, and the
+# offset for timezone-aware values), dates are stored at midnight and times
+# always carry microseconds.
+DATETIME_TEXT_FORMAT = "%Y-%m-%d %H:%M:%S%.6f"
+TIME_TEXT_FORMAT = "%H:%M:%S%.6f"
+
+# Covering indexes for the dashboard read paths: table -> (index, key columns,
+# covered columns). SQLite has no INCLUDE clause, so covered columns are simply
+# appended to the key. Columns missing from a table (e.g. week on season-level
+# team stats, or anything dropped via --columns) are left out.
+COVERING_INDEXES: dict[str, tuple[str, list[str], list[str]]] = {
+    "team_stats": (
+        "idx_team_stats_cover",
+        ["season", "team", "week"],
+        ["passing_epa", "rushing_epa", "receiving_epa"],
+    ),
+    "schedules": (
+        "idx_schedules_cover",
+        ["season", "week"],
+        ["game_id", "home_team", "away_team", "home_score", "away_score"],
+    ),
+    "rosters": (
+        "idx_rosters_cover",
+        ["season", "team"],
+        ["position", "gsis_id", "full_name"],
+    ),
+    "injuries": (
+        "idx_injuries_cover",
+        ["season", "week", "team"],
+        ["gsis_id", "report_status"],
+    ),
+}
+# Indexes from earlier versions of this script, replaced by COVERING_INDEXES.
+LEGACY_INDEXES = {
+    "team_stats": "idx_team_stats_season_team",
+    "schedules": "idx_schedules_season_week",
+    "rosters": "idx_rosters_season_team",
+    "injuries": "idx_injuries_season_week_team",
+}
+
+# Bulk-ingest settings. WAL with synchronous=NORMAL never corrupts the database,
+# but a power loss can drop the most recently committed transaction; re-running
+# the refresh recovers it. WAL mode is persistent in the database file.
+SQLITE_PRAGMAS = [
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "cache_size=-262144",
+    "mmap_size=268435456",
+]
 
 
 def parse_args() -> argparse.Namespace:
@@ -42,23 +166,295 @@ def parse_args() -> argparse.Namespace:
         default=Path("data/nflverse.sqlite"),
         help="SQLite database path (default: data/nflverse.sqlite).",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--staging-dir",
+        type=Path,
+        default=Path("data/staging"),
+        help="Parent directory for per-run Parquet copies of the downloads (default: data/staging). A run's copies are kept if it fails.",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--download-only",
+        action="store_true",
+        help="Download and stage the seasons without touching the database.",
+    )
+    mode.add_argument(
+        "--from-staging",
+        type=Path,
+        metavar="RUN_DIR",
+        help="Load the database from a run directory staged earlier instead of the network. The seasons and summary levels are read from the run directory's manifest.",
+    )
+    parser.add_argument(
+        "--columns",
+        type=column_allowlist,
+        action="append",
+        default=[],
+        metavar="TABLE=COL[,COL...]",
+        help="Only persist the listed columns of TABLE (repeat flag for multiple tables). The season column is always kept.",
+    )
+    args = parser.parse_args()
+    if args.from_staging is not None and args.seasons:
+        parser.error("--season cannot be combined with --from-staging; the run directory lists its seasons")
+    return args
+
+
+def column_allowlist(spec: str) -> tuple[str, list[str]]:
+    table_name, _, columns = spec.partition("=")
+    cols = [col.strip() for col in columns.split(",") if col.strip()]
+    if not table_name.strip() or not cols:
+        raise argparse.ArgumentTypeError(f"expected TABLE=COL[,COL...], got {spec!r}")
+    table_name = table_name.strip()
+    if table_name not in EXPORT_TABLES:
+        raise argparse.ArgumentTypeError(
+            f"unknown table {table_name!r}; expected one of {', '.join(sorted(EXPORT_TABLES))}"
+        )
+    return table_name, cols
+
+
+def quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def sqlite_ddl(frame: pl.DataFrame, table_name: str) -> str:
+    col_defs = ", ".join(
+        f"{quote(col)} {SQLITE_TYPES.get(dtype.base_type(), 'TEXT')}"
+        for col, dtype in frame.schema.items()
+    )
+    return f"CREATE TABLE {table_name} ({col_defs})"
+
+
+def insert_batch_rows() -> int:
+    # Read at write time rather than import time so a bad value fails the
+    # export with a clear message instead of breaking every importer.
+    value = os.environ.get("NFL_DATA_INSERT_BATCH_ROWS")
+    if value is None:
+        return INSERT_BATCH_ROWS
+    try:
+        rows = int(value)
+    except ValueError:
+        raise ValueError(
+            f"NFL_DATA_INSERT_BATCH_ROWS must be an integer, got {value!r}"
+        ) from None
+    return max(1, rows)
+
+
+def write_frame(conn: sqlite3.Connection, table_name: str, frame: pl.DataFrame) -> None:
+    cols = [quote(col) for col in frame.columns]
+    # sqlite3's built-in date adapters are deprecated; format temporals as text.
+    frame = frame.with_columns(cs.date().cast(pl.Datetime("us"))).with_columns(
+        cs.datetime(time_zone=None)
+        .dt.to_string(DATETIME_TEXT_FORMAT)
+        .str.replace(".000000", "", literal=True),
+        cs.datetime(time_zone="*")
+        .dt.to_string(DATETIME_TEXT_FORMAT + "%:z")
+        .str.replace(".000000", "", literal=True),
+        cs.time().dt.to_string(TIME_TEXT_FORMAT),
+        cs.duration().to_physical(),
+    )
+    # sqlite3 cannot bind lists, dicts or Decimals; store them as text to
+    # match their TEXT column.
+    text_cols: list[pl.Series | pl.Expr] = []
+    for col, dtype in frame.schema.items():
+        if dtype.is_nested():
+            text_cols.append(
+                pl.Series(
+                    col,
+                    [
+                        None if value is None else json.dumps(value, default=str)
+                        for value in frame[col].to_list()
+                    ],
+                    dtype=pl.String,
+                )
+            )
+        elif dtype.base_type() not in SQLITE_TYPES:
+            text_cols.append(pl.col(col).cast(pl.String))
+    frame = frame.with_columns(text_cols)
+    sql = (
+        f"INSERT INTO {table_name} ({', '.join(cols)}) "
+        f"VALUES ({', '.join('?' * len(cols))})"
+    )
+    for batch in frame.iter_slices(n_rows=insert_batch_rows()):
+        conn.executemany(sql, batch.iter_rows())
+
+
+def content_hash(frame: pl.DataFrame) -> str:
+    # Polars row hashes are only stable within a Polars version; an upgrade
+    # costs one full re-ingest, never a missed change.
+    return f"{frame.hash_rows().sum():016x}"
+
+
+def stored_hash(conn: sqlite3.Connection, table_name: str, season: int) -> str | None:
+    row = conn.execute(
+        "SELECT content_hash FROM ingest_metadata WHERE table_name = ? AND season = ? "
+        "AND EXISTS (SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?)",
+        (table_name, season, table_name),
+    ).fetchone()
+    return row[0] if row else None
+
+
+def create_season_index(conn: sqlite3.Connection, table_name: str) -> None:
+    conn.execute(
+        f"CREATE INDEX IF NOT EXISTS idx_{table_name}_season ON {table_name}(season)"
+    )
+
 
+def clear_season(conn: sqlite3.Connection, table_name: str, season: int) -> bool:
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (table_name,),
+    ).fetchone()
+    if exists is None:
+        return False
 
-def to_pandas(frame: pl.DataFrame | pd.DataFrame) -> pd.DataFrame:
-    if isinstance(frame, pd.DataFrame):
-        return frame
-    return frame.to_pandas()
+    total, kept = conn.execute(
+        f"SELECT COUNT(*), TOTAL(season IS NOT ?) FROM {table_name}", (season,)
+    ).fetchone()
+    if total == kept:
+        return True
+
+    conn.execute("SAVEPOINT clear_season")
+    try:
+        if kept < SWAP_KEEP_RATIO * total:
+            # Park the few surviving rows, empty the table through SQLite's
+            # truncate optimization and copy them back. The table itself, its
+            # indexes and any views or triggers on it are left untouched.
+            conn.execute(
+                f"CREATE TEMP TABLE clear_season_keep AS SELECT * FROM {table_name} WHERE season IS NOT ?",
+                (season,),
+            )
+            conn.execute(f"DELETE FROM {table_name}")
+            conn.execute(f"INSERT INTO {table_name} SELECT * FROM temp.clear_season_keep")
+            conn.execute("DROP TABLE temp.clear_season_keep")
+        else:
+            conn.execute(f"DELETE FROM {table_name} WHERE season = ?", (season,))
+    except BaseException:
+        conn.execute("ROLLBACK TO clear_season")
+        conn.execute("RELEASE clear_season")
+        raise
+    conn.execute("RELEASE clear_season")
+    return True
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection) -> Iterator[None]:
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
 
 
 def try_load(label: str, loader: Callable[[], pl.DataFrame]) -> pl.DataFrame | None:
     try:
         return loader()
     except Exception as exc:  # noqa: BLE001
-        print(f"Warning: {label} unavailable ({exc}). Skipping.")
+        logger.warning("Warning: %s unavailable (%s). Skipping.", label, exc)
         return None
 
 
+def adv_table_names(advstats_summary: str) -> dict[str, str]:
+    return {
+        stat_type: f"pfr_advstats_{stat_type}_{advstats_summary}"
+        for stat_type in ADV_STAT_TYPES
+    }
+
+
+def stage_names(summary_level: str, advstats_summary: str) -> dict[str, str]:
+    # Staged file names carry the summary level, so a stage downloaded with
+    # other settings is reported missing instead of loaded under wrong labels.
+    names = {
+        "team_stats": f"team_stats_{summary_level}",
+        "schedules": "schedules",
+        "rosters": "rosters",
+        "injuries": "injuries",
+    }
+    names.update({name: name for name in adv_table_names(advstats_summary).values()})
+    return names
+
+
+def staged_path(staging_dir: Path, stage_name: str, season: int) -> Path:
+    return staging_dir / f"{stage_name}_{season}.parquet"
+
+
+def staged_files(
+    staging_dir: Path, seasons: list[int], summary_level: str, advstats_summary: str
+) -> list[Path]:
+    return [
+        staged_path(staging_dir, stage_name, season)
+        for season in seasons
+        for stage_name in stage_names(summary_level, advstats_summary).values()
+    ]
+
+
+def write_manifest(
+    run_dir: Path, seasons: list[int], summary_level: str, advstats_summary: str
+) -> None:
+    manifest = {
+        "seasons": seasons,
+        "summary_level": summary_level,
+        "advstats_summary": advstats_summary,
+    }
+    (run_dir / STAGE_MANIFEST).write_text(json.dumps(manifest), encoding="utf-8")
+
+
+def read_manifest(run_dir: Path) -> tuple[list[int], str, str]:
+    path = run_dir / STAGE_MANIFEST
+    if not path.exists():
+        raise FileNotFoundError(f"{run_dir} has no {STAGE_MANIFEST}; is it a staged run directory?")
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    return manifest["seasons"], manifest["summary_level"], manifest["advstats_summary"]
+
+
+def download_season(
+    season: int,
+    *,
+    summary_level: str,
+    advstats_summary: str,
+    staging_dir: Path,
+) -> None:
+    logger.info("\n=== Downloading season %s ===", season)
+    adv_tables = adv_table_names(advstats_summary)
+    loaders: list[tuple[str, Callable[[], pl.DataFrame]]] = [
+        ("team_stats", lambda: nfl.load_team_stats(season, summary_level=summary_level)),
+        ("schedules", lambda: nfl.load_schedules(season)),
+        ("rosters", lambda: nfl.load_rosters(season)),
+        ("injuries", lambda: nfl.load_injuries(season)),
+    ]
+    for stat_type, table_name in adv_tables.items():
+        loaders.append(
+            (
+                table_name,
+                lambda st=stat_type: nfl.load_pfr_advstats(
+                    season, stat_type=st, summary_level=advstats_summary
+                ),
+            )
+        )
+
+    # The downloads are independent network round-trips, so fetch them
+    # concurrently and stage each frame as soon as it is available.
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+        futures = {name: pool.submit(loader) for name, loader in loaders}
+        frames: dict[str, pl.DataFrame | None] = {
+            "team_stats": futures.pop("team_stats").result(),
+            "schedules": futures.pop("schedules").result(),
+            "rosters": try_load("rosters", futures.pop("rosters").result),
+            "injuries": try_load("injuries", futures.pop("injuries").result),
+        }
+        for stat_type, table_name in adv_tables.items():
+            frames[table_name] = try_load(
+                f"pfr advanced stats ({stat_type})", futures.pop(table_name).result
+            )
+
+    names = stage_names(summary_level, advstats_summary)
+    for table_name, frame in frames.items():
+        if frame is not None:
+            frame.write_parquet(
+                staged_path(staging_dir, names[table_name], season), compression="zstd"
+            )
+
+
 def export_season(
     season: int,
     *,
@@ -66,124 +462,273 @@ def export_season(
     advstats_summary: str,
     conn: sqlite3.Connection,
     timestamp: str,
-) -> list[dict[str, object]]:
-    print(f"\n=== Exporting season {season} ===")
-    team_stats = nfl.load_team_stats(season, summary_level=summary_level)
-    schedules = nfl.load_schedules(season)
-    rosters = try_load("rosters", lambda: nfl.load_rosters(season))
-    injuries = try_load("injuries", lambda: nfl.load_injuries(season))
-
-    adv_tables: dict[str, pd.DataFrame] = {}
-    for stat_type in ADV_STAT_TYPES:
-        table_name = f"pfr_advstats_{stat_type}_{advstats_summary}"
-        adv_df = try_load(
-            f"pfr advanced stats ({stat_type})",
-            lambda st=stat_type: nfl.load_pfr_advstats(
-                season, stat_type=st, summary_level=advstats_summary
-            ),
-        )
-        if adv_df is not None:
-            adv_tables[table_name] = to_pandas(adv_df)
+    columns: dict[str, list[str]],
+    staging_dir: Path,
+) -> tuple[list[MetadataRow], set[str]]:
+    logger.info("\n=== Exporting season %s ===", season)
+    names = stage_names(summary_level, advstats_summary)
 
-    metadata_rows: list[dict[str, object]] = []
+    def load_staged(table_name: str) -> pl.DataFrame | None:
+        path = staged_path(staging_dir, names[table_name], season)
+        if not path.exists():
+            if table_name in REQUIRED_TABLES:
+                raise FileNotFoundError(
+                    f"{table_name} for season {season} is not staged in {staging_dir}"
+                )
+            return None
+
+        frame = pl.scan_parquet(path)
+        if table_name in columns:
+            keep = columns[table_name]
+            if "season" not in keep:
+                keep = ["season", *keep]
+            missing = [col for col in keep if col not in frame.collect_schema()]
+            if missing:
+                raise ValueError(
+                    f"--columns for {table_name} names columns not in the feed: "
+                    f"{', '.join(missing)}"
+                )
+            frame = frame.select(keep)
+        return frame.collect()
+
+    metadata_rows: list[MetadataRow] = []
     created_tables: set[str] = set()
 
     def persist(
         table_name: str,
-        frame: pl.DataFrame | pd.DataFrame | None,
+        frame: pl.DataFrame | None,
         summary: str | None,
     ) -> None:
         if frame is None:
             return
 
-        pandas_frame = to_pandas(frame)
-        if pandas_frame.empty and not list(pandas_frame.columns):
-            print(f"Warning: {table_name} empty; skipping.")
+        if frame.width == 0:
+            logger.warning("Warning: %s empty; skipping.", table_name)
             return
 
-        conn.execute(
-            "DELETE FROM ingest_metadata WHERE table_name = ? AND season = ?",
-            (table_name, season),
-        )
-        try:
-            conn.execute(f"DELETE FROM {table_name} WHERE season = ?", (season,))
-        except sqlite3.OperationalError:
-            pass
-
-        pandas_frame.to_sql(table_name, conn, if_exists="append", index=False)
-        metadata_rows.append(
-            {
-                "table_name": table_name,
-                "season": season,
-                "summary_level": summary,
-                "ingested_at": timestamp,
-            }
-        )
+        frame_hash = content_hash(frame)
+        if stored_hash(conn, table_name, season) == frame_hash:
+            logger.info("%s unchanged for season %s; skipping.", table_name, season)
+            return
+
+        table_existed = clear_season(conn, table_name, season)
+        if not table_existed:
+            conn.execute(sqlite_ddl(frame, table_name))
+        write_frame(conn, table_name, frame)
+        metadata_rows.append((table_name, season, summary, timestamp, frame_hash))
         created_tables.add(table_name)
 
-    persist("team_stats", team_stats, summary_level)
-    persist("schedules", schedules, None)
-    persist("rosters", rosters, None)
-    persist("injuries", injuries, None)
+    # Frames are read back one at a time so only the table being written is
+    # held in memory.
+    persist("team_stats", load_staged("team_stats"), summary_level)
+    persist("schedules", load_staged("schedules"), None)
+    persist("rosters", load_staged("rosters"), None)
+    persist("injuries", load_staged("injuries"), None)
 
-    for table_name, df in adv_tables.items():
-        persist(table_name, df, advstats_summary)
+    for table_name in adv_table_names(advstats_summary).values():
+        persist(table_name, load_staged(table_name), advstats_summary)
 
-    if "team_stats" in created_tables:
-        conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_team_stats_season_team ON team_stats(season, team)"
-        )
-    if "schedules" in created_tables:
-        conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_schedules_season_week ON schedules(season, week)"
-        )
-    if "rosters" in created_tables:
-        conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_rosters_season_team ON rosters(season, team)"
-        )
-    if "injuries" in created_tables:
-        conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_injuries_season_week_team ON injuries(season, week, team)"
-        )
-    for stat_type in ADV_STAT_TYPES:
-        table_name = f"pfr_advstats_{stat_type}_{advstats_summary}"
-        if table_name in created_tables:
-            conn.execute(
-                f"CREATE INDEX IF NOT EXISTS idx_{table_name}_season ON {table_name}(season)"
-            )
+    return metadata_rows, created_tables
 
-    return metadata_rows
 
+def create_indexes(conn: sqlite3.Connection, created_tables: set[str]) -> None:
+    for table_name in sorted(created_tables):
+        if table_name in COVERING_INDEXES:
+            index_name, keys, covered = COVERING_INDEXES[table_name]
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table_name})")}
+            cols = [col for col in [*keys, *covered] if col in existing]
+            # The covering index leads with season, so it already serves
+            # clear_season; a separate season index would only slow inserts.
+            conn.execute(f"DROP INDEX IF EXISTS {LEGACY_INDEXES[table_name]}")
+            conn.execute(f"DROP INDEX IF EXISTS idx_{table_name}_season")
+            indexed = [row[2] for row in conn.execute(f"PRAGMA index_info({index_name})")]
+            if indexed != cols:
+                # CREATE INDEX IF NOT EXISTS keeps a stale column set, so rebuild
+                # whenever the table gained or lost covered columns.
+                conn.execute(f"DROP INDEX IF EXISTS {index_name}")
+                conn.execute(
+                    f"CREATE INDEX {index_name} ON {table_name}({', '.join(quote(col) for col in cols)})"
+                )
+        else:
+            # Every other table gets a season index so later refreshes clear a
+            # season with an index seek instead of a full scan.
+            create_season_index(conn, table_name)
 
-def main() -> None:
-    args = parse_args()
-    seasons = args.seasons or [nfl.get_current_season()]
 
-    args.db_path.parent.mkdir(parents=True, exist_ok=True)
+def write_metadata(conn: sqlite3.Connection, metadata_rows: list[MetadataRow]) -> None:
+    if not metadata_rows:
+        return
+    conn.execute(
+        "DELETE FROM ingest_metadata WHERE (table_name, season) IN "
+        f"(VALUES {', '.join(['(?, ?)'] * len(metadata_rows))})",
+        [value for row in metadata_rows for value in row[:2]],
+    )
+    conn.executemany(
+        "INSERT INTO ingest_metadata (table_name, season, summary_level, ingested_at, content_hash) VALUES (?, ?, ?, ?, ?)",
+        metadata_rows,
+    )
+
+
+def load_database(
+    seasons: list[int],
+    summary_level: str,
+    advstats_summary: str,
+    db_path: Path,
+    *,
+    staging_dir: Path,
+    columns: dict[str, list[str]],
+) -> None:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.now(timezone.utc).isoformat()
 
-    with sqlite3.connect(args.db_path) as conn:
+    conn = sqlite3.connect(db_path)
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(f"PRAGMA {pragma}")
+    # Autocommit mode: transactions are opened explicitly, one per season.
+    conn.isolation_level = None
+    try:
         conn.execute(
-            "CREATE TABLE IF NOT EXISTS ingest_metadata (table_name TEXT NOT NULL, season INTEGER NOT NULL, summary_level TEXT, ingested_at TEXT NOT NULL)"
+            "CREATE TABLE IF NOT EXISTS ingest_metadata (table_name TEXT NOT NULL, season INTEGER NOT NULL, summary_level TEXT, ingested_at TEXT NOT NULL, content_hash TEXT)"
         )
+        metadata_cols = {row[1] for row in conn.execute("PRAGMA table_info(ingest_metadata)")}
+        if "content_hash" not in metadata_cols:
+            conn.execute("ALTER TABLE ingest_metadata ADD COLUMN content_hash TEXT")
 
-        all_metadata: list[dict[str, object]] = []
+        created_tables: set[str] = set()
         for season in seasons:
-            metadata_rows = export_season(
-                season,
-                summary_level=args.summary_level,
-                advstats_summary=args.advstats_summary,
-                conn=conn,
-                timestamp=timestamp,
-            )
-            all_metadata.extend(metadata_rows)
+            # The metadata commits with the season's rows, so a later season
+            # failing can never leave committed data behind a stale hash.
+            with transaction(conn):
+                metadata_rows, season_tables = export_season(
+                    season,
+                    summary_level=summary_level,
+                    advstats_summary=advstats_summary,
+                    conn=conn,
+                    timestamp=timestamp,
+                    columns=columns,
+                    staging_dir=staging_dir,
+                )
+                write_metadata(conn, metadata_rows)
+            created_tables |= season_tables
+
+        # Build indexes once, after every season has landed, so SQLite sorts
+        # each table a single time instead of maintaining the B-trees per row.
+        with transaction(conn):
+            create_indexes(conn, created_tables)
+
+        # Refresh planner statistics once for the whole load so readers of the
+        # database pick the right indexes.
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA optimize")
+    finally:
+        conn.close()
 
-        if all_metadata:
-            pd.DataFrame(all_metadata).to_sql(
-                "ingest_metadata", conn, if_exists="append", index=False
+
+def remove_run_dir(run_dir: Path, staged: list[Path]) -> None:
+    # Only remove what the run wrote; rmdir leaves the directory in place if
+    # anything else is in it.
+    for path in [*staged, run_dir / STAGE_MANIFEST]:
+        path.unlink(missing_ok=True)
+    with suppress(OSError):
+        run_dir.rmdir()
+
+
+def run(
+    seasons: Iterable[int],
+    summary_level: str,
+    advstats_summary: str,
+    db_path: Path,
+    *,
+    staging_dir: Path = Path("data/staging"),
+    columns: dict[str, list[str]] | None = None,
+    download_only: bool = False,
+    from_staging: Path | None = None,
+) -> None:
+    seasons = list(seasons)
+    columns = columns or {}
+
+    if from_staging is None:
+        staging_dir.mkdir(parents=True, exist_ok=True)
+        # Every run stages into its own directory so concurrent refreshes can
+        # never read or delete each other's files.
+        run_dir = Path(tempfile.mkdtemp(prefix="run-", dir=staging_dir))
+    else:
+        run_dir = from_staging
+        seasons, summary_level, advstats_summary = read_manifest(run_dir)
+        expected = set(staged_files(run_dir, seasons, summary_level, advstats_summary))
+        unlisted = sorted(set(run_dir.glob("*.parquet")) - expected)
+        if unlisted:
+            raise ValueError(
+                f"{run_dir} holds staged files its manifest does not list: "
+                f"{', '.join(path.name for path in unlisted)}"
             )
+        logger.info(
+            "Loading season(s) %s from %s",
+            ", ".join(str(season) for season in seasons),
+            run_dir,
+        )
+
+    try:
+        if from_staging is None:
+            staged: list[int] = []
+            for season in seasons:
+                download_season(
+                    season,
+                    summary_level=summary_level,
+                    advstats_summary=advstats_summary,
+                    staging_dir=run_dir,
+                )
+                # Record each season once it is fully staged, so a run that
+                # fails part-way can still be loaded for what it did download.
+                staged.append(season)
+                write_manifest(run_dir, staged, summary_level, advstats_summary)
+            if download_only:
+                logger.info(
+                    "\nDone. Downloads staged in %s (load with --from-staging %s)",
+                    run_dir,
+                    run_dir,
+                )
+                return
+
+        load_database(
+            seasons,
+            summary_level,
+            advstats_summary,
+            db_path,
+            staging_dir=run_dir,
+            columns=columns,
+        )
+    except BaseException:
+        if from_staging is None and not any(run_dir.glob("*.parquet")):
+            # Nothing was staged, so there is nothing worth loading later.
+            remove_run_dir(run_dir, [])
+        else:
+            logger.warning("Staged downloads kept in %s", run_dir)
+        raise
 
-    print("\nDone. Updated tables stored in", args.db_path)
+    remove_run_dir(
+        run_dir, staged_files(run_dir, seasons, summary_level, advstats_summary)
+    )
+
+    logger.info("\nDone. Updated tables stored in %s", db_path)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+    args = parse_args()
+    seasons = args.seasons or []
+    if not seasons and args.from_staging is None:
+        seasons = [nfl.get_current_season()]
+    run(
+        seasons,
+        args.summary_level,
+        args.advstats_summary,
+        args.db_path,
+        staging_dir=args.staging_dir,
+        columns=dict(args.columns),
+        download_only=args.download_only,
+        from_staging=args.from_staging,
+    )
 
 
 if __name__ == "__main__":
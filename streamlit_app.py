@@ -1,17 +1,89 @@
 from __future__ import annotations
 
+import logging
+import os
 import subprocess
 import sys
+import threading
 from pathlib import Path
 
-import nflreadpy as nfl
 import streamlit as st
 
-
 ROOT_DIR = Path(__file__).resolve().parent
+
+# Same on-disk nflreadpy cache as the exporter; must be set before import.
+os.environ.setdefault("NFLREADPY_CACHE", "filesystem")
+os.environ.setdefault("NFLREADPY_CACHE_DIR", str(ROOT_DIR / ".nfl_cache"))
+os.environ.setdefault("NFLREADPY_CACHE_DURATION", "3600")
+
+import nflreadpy as nfl  # noqa: E402
+
+from scripts.season_to_sqlite import logger as export_logger  # noqa: E402
+from scripts.season_to_sqlite import run as run_export  # noqa: E402
+
+
+DB_PATH = ROOT_DIR / "data" / "nflverse.sqlite"
+STAGING_DIR = ROOT_DIR / "data" / "staging"
 EXPORT_SCRIPT = ROOT_DIR / "scripts" / "season_to_sqlite.py"
 
 
+class StatusLogHandler(logging.Handler):
+    """Echo exporter log lines into the current Streamlit container."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.thread_id = threading.get_ident()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Other sessions may be refreshing at the same time; only show our run.
+        if record.thread == self.thread_id:
+            st.text(self.format(record).strip())
+
+
+def refresh_in_process(seasons: list[int], summary_level: str, adv_summary: str) -> None:
+    handler = StatusLogHandler()
+    export_logger.addHandler(handler)
+    export_logger.setLevel(logging.INFO)
+    try:
+        run_export(seasons, summary_level, adv_summary, DB_PATH, staging_dir=STAGING_DIR)
+    finally:
+        export_logger.removeHandler(handler)
+
+
+def refresh_in_subprocess(seasons: list[int], summary_level: str, adv_summary: str) -> None:
+    command = [sys.executable, "-u", str(EXPORT_SCRIPT)]
+    command.extend(["--advstats-summary", adv_summary, "--summary-level", summary_level])
+    for season in seasons:
+        command.extend(["--season", str(season)])
+
+    # Show each line as the exporter prints it rather than buffering the run.
+    with subprocess.Popen(
+        command,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+        cwd=ROOT_DIR,
+    ) as process:
+        for line in process.stdout:
+            if line.strip():
+                st.text(line.rstrip())
+    if process.returncode != 0:
+        raise RuntimeError(f"Exporter exited with code {process.returncode}.")
+
+
+@st.cache_data(ttl=3600)
+def _current_season() -> int:
+    return nfl.get_current_season()
+
+
+# cache_resource hands back the same tuple on every rerun instead of
+# unpickling a fresh copy the way cache_data would.
+@st.cache_resource
+def _season_options(current_season: int) -> tuple[int, ...]:
+    return tuple(range(current_season, 1999 - 1, -1))
+
+
 st.set_page_config(page_title="NFL Data Refresh", page_icon="🏈", layout="centered")
 st.title("NFL Data Refresh Dashboard")
 st.write(
@@ -19,8 +91,8 @@ st.write(
     "the scheduled GitHub Actions run."
 )
 
-current_season = nfl.get_current_season()
-season_options = list(range(current_season, 1999 - 1, -1))
+current_season = _current_season()
+season_options = _season_options(current_season)
 
 selected_seasons = st.multiselect(
     "Select seasons to refresh",
@@ -45,45 +117,34 @@ summary_level = st.selectbox(
     help="Controls the level of aggregation for team statistics.",
 )
 
+isolate_export = st.checkbox(
+    "Run exporter in a separate process",
+    value=False,
+    help="Slower to start, but the exporter's memory is released when it "
+    "finishes and a crash cannot take the app down with it.",
+)
+
 st.divider()
 
 if st.button("Refresh Data"):
     if not selected_seasons:
         st.warning("Please select at least one season before refreshing.")
-    elif not EXPORT_SCRIPT.exists():
-        st.error(
-            f"Export script not found at {EXPORT_SCRIPT}. "
-            "Ensure you are running the app from the repository root."
-        )
     else:
-        st.info("Refresh in progress… this may take a minute.")
-        with st.spinner("Downloading data and updating SQLite database…"):
-            command = [sys.executable, str(EXPORT_SCRIPT)]
-            command.extend(["--advstats-summary", adv_summary, "--summary-level", summary_level])
-            for season in sorted(selected_seasons):
-                command.extend(["--season", str(season)])
-
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                cwd=ROOT_DIR,
-            )
-
-        if result.returncode == 0:
-            st.success("Refresh completed successfully.")
-        else:
-            st.error(f"Exporter exited with code {result.returncode}.")
-
-        with st.expander("Show exporter output", expanded=result.returncode != 0):
-            stdout = result.stdout.strip()
-            stderr = result.stderr.strip()
-            if stdout:
-                st.subheader("stdout")
-                st.code(stdout, language="text")
-            if stderr:
-                st.subheader("stderr")
-                st.code(stderr, language="text")
+        with st.status(
+            "Downloading data and updating SQLite database…", expanded=True
+        ) as status:
+            refresh = refresh_in_subprocess if isolate_export else refresh_in_process
+            try:
+                refresh(sorted(selected_seasons), summary_level, adv_summary)
+            except Exception as exc:  # noqa: BLE001
+                status.update(label="Refresh failed.", state="error")
+                st.exception(exc)
+            else:
+                status.update(
+                    label="Refresh completed successfully.",
+                    state="complete",
+                    expanded=False,
+                )
 
 st.sidebar.header("Quick Start")
 st.sidebar.write(